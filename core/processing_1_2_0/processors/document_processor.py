@@ -7,6 +7,7 @@ in OneDrive via Microsoft Graph API.
 """
 
 from typing import Dict, Any, Union
+import asyncio
 import logging
 import os
 import json
@@ -161,7 +162,9 @@ class DocumentProcessor(BaseProcessor):
             try:
                 with open(file_path, 'rb') as f:
                     file_content = f.read()
-                    additional_metadata = MetadataExtractor.extract_metadata(file_content, content_type)
+                additional_metadata = await asyncio.to_thread(
+                    MetadataExtractor.extract_metadata, file_content, content_type
+                )
             except Exception as e:
                 logger.warning(f"Error extracting additional metadata: {str(e)}")
             
@@ -258,8 +261,11 @@ class DocumentProcessor(BaseProcessor):
             with open(file_path, 'rb') as f:
                 file_content = f.read()
             
-            # Extract text using TextExtractor
-            text_content = TextExtractor.extract_text(file_content, content_type)
+            # Extract text using TextExtractor on a worker thread so parsing
+            # does not block the event loop while other files download
+            text_content = await asyncio.to_thread(
+                TextExtractor.extract_text, file_content, content_type
+            )
             
             # Handle extraction errors
             if text_content.startswith('Error'):
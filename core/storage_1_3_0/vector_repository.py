@@ -1,11 +1,11 @@
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 import asyncio
 import logging
 import os
 
 import orjson
-from openai import OpenAI
+from openai import AsyncOpenAI
 from openai.types.file_object import FileObject
 
 from core.utils.config import config
@@ -24,7 +24,7 @@ class VectorRepository:
         max_retries: int = 3
     ):
         """Initialize the vector store repository."""
-        self.client = OpenAI(
+        self.client = AsyncOpenAI(
             api_key=api_key or config["openai"]["api_key"]
         )
         self.store_id = config["openai"]["vector_store_id"]
@@ -32,44 +32,49 @@ class VectorRepository:
         self.graph_client = GraphClient()
         logger.info(f"Initialized vector store repository with store ID: {self.store_id}")
 
-   def _build_attrs(self, meta: Dict[str, Any]) -> Dict[str, str]:
-    """Build attributes from metadata for vector store."""
-    attrs: Dict[str, str] = {}
+    async def close(self):
+        """Close the OpenAI and Graph HTTP clients."""
+        await self.client.close()
+        await self.graph_client.close()
 
-    # --- your existing logic here ---
-    for k in KEEP:
-        if v := meta.get(k):
-            attrs[k.replace("from_", "from")] = str(v)[:512]
+    def _build_attrs(self, meta: Dict[str, Any]) -> Dict[str, str]:
+        """Build attributes from metadata for vector store."""
+        attrs: Dict[str, str] = {}
 
-    if recipients := meta.get("to", []) + meta.get("cc", []):
-        attrs["recipients"] = ",".join(str(r) for r in recipients)[:512]
+        # --- your existing logic here ---
+        for k in KEEP:
+            if v := meta.get(k):
+                attrs[k.replace("from_", "from")] = str(v)[:512]
 
-    if meta.get("last_modified") and meta.get("created_at"):
-        attrs["dates"] = orjson.dumps({
-            "c": meta["created_at"][:19],
-            "m": meta["last_modified"][:19]
-        }).decode()
+        if recipients := meta.get("to", []) + meta.get("cc", []):
+            attrs["recipients"] = ",".join(str(r) for r in recipients)[:512]
 
-    if parent_id := meta.get("parent_email_id"):
-        attrs["rel"] = str(parent_id)
+        if meta.get("last_modified") and meta.get("created_at"):
+            attrs["dates"] = orjson.dumps({
+                "c": meta["created_at"][:19],
+                "m": meta["last_modified"][:19]
+            }).decode()
 
-    if tags := meta.get("tags"):
-        attrs["tags"] = ",".join(str(t) for t in tags)[:512]
+        if parent_id := meta.get("parent_email_id"):
+            attrs["rel"] = str(parent_id)
 
-    if one_drive_url := meta.get("one_drive_url", ""):
-        attrs["source_id"] = one_drive_url.rpartition("/")[-1]
+        if tags := meta.get("tags"):
+            attrs["tags"] = ",".join(str(t) for t in tags)[:512]
 
-    attrs["version"] = "v1"
+        if one_drive_url := meta.get("one_drive_url", ""):
+            attrs["source_id"] = one_drive_url.rpartition("/")[-1]
 
-    # --- new extension logic ---
-    filename = meta.get("filename", "")
-    if "." in filename:
-        ext = filename.rsplit(".", 1)[1].lower()
-        attrs["extension"] = f".{ext}"  # e.g. ".xls" or ".xlsx"
-    else:
-        attrs["extension"] = ""
+        attrs["version"] = "v1"
 
-    return attrs
+        # --- new extension logic ---
+        filename = meta.get("filename", "")
+        if "." in filename:
+            ext = filename.rsplit(".", 1)[1].lower()
+            attrs["extension"] = f".{ext}"  # e.g. ".xls" or ".xlsx"
+        else:
+            attrs["extension"] = ""
+
+        return attrs
 
     def _extract_text_content(self, meta: Dict[str, Any]) -> str:
         """Extract text content from metadata, handling different possible field names."""
@@ -115,12 +120,12 @@ class VectorRepository:
             logger.info(f"Uploading to vector store {self.store_id}")
             
             # Create file in OpenAI and upload to vector store
-            file: FileObject = self.client.files.create(
+            file: FileObject = await self.client.files.create(
                 file=(os.path.splitext(file_name)[0] + ".txt", text_content, "text/plain"),
                 purpose="assistants"
             )
 
-            self.client.vector_stores.files.create(
+            await self.client.vector_stores.files.create(
                 self.store_id,
                 file_id=file.id,
                 attributes=self._build_attrs(meta)
@@ -133,20 +138,34 @@ class VectorRepository:
             logger.error(f"Failed to upload {file_info.get('name', 'unknown')}: {e}")
             return False
 
-    async def batch_upload(self, directory: str, batch_size: int = 10, file_filter: Optional[callable] = None) -> Dict[str, int]:
+    async def batch_upload(
+        self,
+        directory: str,
+        batch_size: int = 10,
+        file_filter: Optional[callable] = None,
+        files: Optional[List[Dict[str, Any]]] = None,
+        names: Optional[Set[str]] = None
+    ) -> Dict[str, int]:
         """Upload multiple documents in batches from OneDrive.
         
         Args:
             directory: OneDrive directory path containing the files
             batch_size: Number of files to process in each batch
             file_filter: Optional function to filter which files to process
+            files: Optional listing of directory already fetched by the caller,
+                used instead of listing the folder again
+            names: Optional set of file names to restrict the upload to
         """
         stats = {"success": 0, "failed": 0}
         
         try:
-            # List files in the OneDrive directory
-            files = await list_folder_contents(directory)
-            json_files = [f for f in files if f["name"].endswith(".json")]
+            # List files in the OneDrive directory unless the caller already has them
+            if files is None:
+                files = await list_folder_contents(directory)
+            json_files = [
+                f for f in files
+                if f["name"].endswith(".json") and (names is None or f["name"] in names)
+            ]
             
             # Apply file filter if provided
             if file_filter:
@@ -6,17 +6,23 @@ def format_timestamp(dt):
     """Format a datetime object as a string (YYYY-MM-DD HH:MM:SS)."""
     if not isinstance(dt, datetime):
         raise ValueError("Input must be a datetime object.")
-    return dt.strftime("%Y-%m-%d %H:%M:%S")
+    # isoformat avoids strftime's format parsing; drop tzinfo so aware
+    # datetimes keep the same fixed-width output without a UTC offset
+    return dt.replace(tzinfo=None).isoformat(sep=" ", timespec="seconds")
+
+# Path separators and special characters mapped to underscores
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys('\\/:*?"<>|@#', '_'))
+# Runs of whitespace and underscores collapse to a single underscore
+_UNDERSCORE_RUN_RE = re.compile(r'[\s_]+')
 
 def sanitize_filename(filename):
     """Sanitize a filename by replacing spaces and special characters with underscores."""
     if not isinstance(filename, str):
         return ""
     # Replace path separators and special characters with underscores
-    sanitized = re.sub(r'[\\/:*?"<>|@#]', '_', filename)
+    sanitized = filename.translate(_SANITIZE_TABLE)
     # Replace spaces with underscores and collapse multiple underscores
-    sanitized = re.sub(r'\s+', '_', sanitized)
-    sanitized = re.sub(r'_+', '_', sanitized)
+    sanitized = _UNDERSCORE_RUN_RE.sub('_', sanitized)
     return sanitized.strip('_')
 
 def get_file_extension(filename):
@@ -25,12 +31,13 @@ def get_file_extension(filename):
         return ""
     return os.path.splitext(filename)[1][1:]  # Exclude the dot
 
+_EMAIL_RE = re.compile(r'^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$')
+
 def is_valid_email(email):
     """Validate an email address using a regex pattern."""
     if not isinstance(email, str):
         return False
-    pattern = r'^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$'
-    return re.match(pattern, email) is not None
+    return _EMAIL_RE.match(email) is not None
 
 def format_error_message(error):
     """Format an error message for logging.
@@ -8,15 +8,21 @@ This module handles all interactions with Microsoft Graph API, including:
 """
 
 from typing import List, Dict, Any
+import asyncio
+import base64
 import os
 from msal import PublicClientApplication, ConfidentialClientApplication
 from core.utils.config import get_env_variable, config
 from core.utils.logging import get_logger
 import httpx
 import json
+from urllib.parse import quote
 
 logger = get_logger(__name__)
 
+# Maximum number of sub-requests Graph accepts in one $batch call
+GRAPH_BATCH_LIMIT = 20
+
 class GraphClient:
     """Client for interacting with Microsoft Graph API."""
     
@@ -36,8 +42,15 @@ class GraphClient:
             authority=f"https://login.microsoftonline.com/{self.tenant_id}"
         )
         
-        # Create an async httpx client
-        self.client = httpx.AsyncClient()
+        # Create an async httpx client; keep idle connections to Graph open
+        # longer than httpx's 5s default so pauses between calls reuse them
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+        )
+        
+    async def close(self):
+        """Close the HTTP client."""
+        await self.client.aclose()
         
     async def _get_access_token(self) -> str:
         """Get a valid access token, refreshing if necessary."""
@@ -218,4 +231,110 @@ class GraphClient:
         url = f"https://graph.microsoft.com/v1.0/users/{user_email}/drive/root:/{folder_path}/{file_name}:/content"
         response = await self.client.get(url, headers=headers, follow_redirects=True)
         response.raise_for_status()
-        return response.content 
\ No newline at end of file
+        return response.content
+
+    async def download_file_stream(self, folder_path: str, file_name: str, dst_path: str, chunk_size: int = 1 << 20) -> int:
+        """Stream a file from OneDrive to dst_path without buffering it in memory.
+
+        Args:
+            folder_path: OneDrive folder containing the file.
+            file_name: Name of the file to download.
+            dst_path: Local path the file is written to.
+            chunk_size: Size of each chunk read from the response.
+
+        Returns:
+            Number of bytes written to dst_path.
+        """
+        logger.info(f"Streaming file {file_name} from folder {folder_path} to {dst_path}")
+        access_token = await self._get_access_token()
+        headers = {"Authorization": f"Bearer {access_token}"}
+        user_email = get_env_variable('user_email')
+        # Remove leading/trailing slashes for safety
+        folder_path = folder_path.strip("/")
+        url = f"https://graph.microsoft.com/v1.0/users/{user_email}/drive/root:/{folder_path}/{file_name}:/content"
+        written = 0
+        async with self.client.stream("GET", url, headers=headers, follow_redirects=True) as response:
+            response.raise_for_status()
+            with open(dst_path, "wb") as f:
+                async for chunk in response.aiter_bytes(chunk_size):
+                    f.write(chunk)
+                    written += len(chunk)
+        return written
+
+    async def download_many(self, folder_path: str, file_names: List[str]) -> Dict[str, bytes]:
+        """Download several files from one OneDrive folder using Graph JSON batching.
+
+        Files are requested in $batch calls of up to GRAPH_BATCH_LIMIT sub-requests.
+        Any file whose sub-request is throttled (429) or fails is downloaded
+        individually with download_file_from_onedrive instead.
+
+        Args:
+            folder_path: OneDrive folder containing the files.
+            file_names: Names of the files to download.
+
+        Returns:
+            Dict mapping each file name to its content. Files that could not
+            be downloaded are logged and omitted.
+        """
+        logger.info(f"Batch downloading {len(file_names)} files from folder {folder_path}")
+        access_token = await self._get_access_token()
+        headers = {"Authorization": f"Bearer {access_token}"}
+        user_email = get_env_variable('user_email')
+        # Remove leading/trailing slashes for safety
+        folder_path = folder_path.strip("/")
+        # Sub-request URLs are sent as JSON, so httpx does not encode them for us
+        quoted_folder = quote(folder_path)
+
+        contents: Dict[str, bytes] = {}
+        redirects: Dict[str, str] = {}
+        fallback: List[str] = []
+        for start in range(0, len(file_names), GRAPH_BATCH_LIMIT):
+            chunk = file_names[start:start + GRAPH_BATCH_LIMIT]
+            payload = {
+                "requests": [
+                    {
+                        "id": str(i),
+                        "method": "GET",
+                        "url": f"/users/{user_email}/drive/root:/{quoted_folder}/{quote(name)}:/content"
+                    }
+                    for i, name in enumerate(chunk)
+                ]
+            }
+            response = await self.client.post(
+                "https://graph.microsoft.com/v1.0/$batch",
+                headers=headers,
+                json=payload
+            )
+            response.raise_for_status()
+
+            answered = set()
+            for sub in response.json().get("responses", []):
+                name = chunk[int(sub["id"])]
+                answered.add(name)
+                status = sub.get("status")
+                location = sub.get("headers", {}).get("Location")
+                if status == 302 and location:
+                    # Content requests redirect to a pre-authenticated download URL
+                    redirects[name] = location
+                elif status == 200 and isinstance(sub.get("body"), str):
+                    contents[name] = base64.b64decode(sub["body"])
+                else:
+                    logger.warning(f"Batch download of {name} returned {status}, retrying individually")
+                    fallback.append(name)
+            fallback.extend(name for name in chunk if name not in answered)
+
+        async def _follow(url: str) -> bytes:
+            redirected = await self.client.get(url, follow_redirects=True)
+            redirected.raise_for_status()
+            return redirected.content
+
+        pending = [(name, _follow(url)) for name, url in redirects.items()]
+        pending += [(name, self.download_file_from_onedrive(folder_path, name)) for name in fallback]
+        results = await asyncio.gather(*(coro for _, coro in pending), return_exceptions=True)
+        for (name, _), result in zip(pending, results):
+            if isinstance(result, Exception):
+                # Leave failed files out so callers treat them as not downloaded
+                logger.error(f"Failed to download {name}: {str(result)}")
+            else:
+                contents[name] = result
+        return contents
@@ -1,2 +1,9 @@
+import pytest
 from dotenv import load_dotenv
-load_dotenv() 
\ No newline at end of file
+load_dotenv()
+
+def pytest_collection_modifyitems(items):
+    """Keep the API tests on one xdist worker while the rest of the suite runs in parallel."""
+    for item in items:
+        if item.path.name == "test_api.py":
+            item.add_marker(pytest.mark.xdist_group("api_io_bound"))
@@ -59,5 +59,57 @@ async def test_vector_repository_upload():
         test_dir.rmdir()
         # Note: We're not deleting the vector store as the API doesn't support deletion yet
 
+@pytest.fixture
+def offline_repo():
+    """VectorRepository with no clients whose uploads are recorded instead of sent."""
+    repo = VectorRepository.__new__(VectorRepository)
+    repo.store_id = "vs_test"
+    repo.uploaded = []
+
+    async def _upload(file):
+        repo.uploaded.append(file["name"])
+        return True
+
+    repo.upload_document = _upload
+    return repo
+
+def listing(*names):
+    return [{"name": name} for name in names]
+
+async def test_batch_upload_uses_supplied_listing(offline_repo, monkeypatch):
+    """A listing passed in via files is used instead of listing the folder."""
+    async def _list(directory):
+        raise AssertionError("folder should not be listed")
+
+    monkeypatch.setattr("core.storage_1_3_0.vector_repository.list_folder_contents", _list)
+    stats = await offline_repo.batch_upload("processed", files=listing("a.json", "b.pdf"))
+    assert stats == {"success": 1, "failed": 0}
+    assert offline_repo.uploaded == ["a.json"]
+
+async def test_batch_upload_lists_folder_without_files(offline_repo, monkeypatch):
+    """Without files, the folder is listed once."""
+    calls = []
+
+    async def _list(directory):
+        calls.append(directory)
+        return listing("a.json")
+
+    monkeypatch.setattr("core.storage_1_3_0.vector_repository.list_folder_contents", _list)
+    await offline_repo.batch_upload("processed")
+    assert calls == ["processed"]
+    assert offline_repo.uploaded == ["a.json"]
+
+async def test_batch_upload_filters_by_names_and_file_filter(offline_repo):
+    """names narrows the .json files, and file_filter still applies afterwards."""
+    files = listing("a.json", "b.json", "c.json", "a.pdf")
+    stats = await offline_repo.batch_upload(
+        "processed",
+        files=files,
+        names={"a.json", "b.json", "a.pdf"},
+        file_filter=lambda f: f["name"] != "b.json"
+    )
+    assert stats == {"success": 1, "failed": 0}
+    assert offline_repo.uploaded == ["a.json"]
+
 if __name__ == "__main__":
     asyncio.run(test_vector_repository_upload()) 
\ No newline at end of file
@@ -36,24 +36,33 @@ async def clear_data_folders(folders: Optional[List[str]] = None):
     else:
         folders_to_clear = data_folders
     
-    # Clear each folder
-    success_count = 0
-    error_count = 0
+    # Clear all folders concurrently
+    results = await asyncio.gather(
+        *(clear_folder(folder_path) for folder_path in folders_to_clear.values()),
+        return_exceptions=True
+    )
     
-    for folder_name, folder_path in folders_to_clear.items():
-        try:
-            await clear_folder(folder_path)
+    for folder_name, result in zip(folders_to_clear.keys(), results):
+        if isinstance(result, Exception):
+            print(f"Error: {folder_name} - {str(result)}")
+        else:
             print(f"Cleared: {folder_name}")
-            success_count += 1
-        except Exception as e:
-            print(f"Error: {folder_name} - {str(e)}")
-            error_count += 1
+    
+    success_count = sum(1 for r in results if not isinstance(r, Exception))
+    error_count = len(results) - success_count
     
     print(f"\nCompleted: {success_count} cleared, {error_count} failed")
 
 if __name__ == "__main__":
+    # Prefer the libuv-based loop when available (installed with uvicorn[standard]);
+    # uvloop.run only exists from uvloop 0.18, so older installs fall back too
+    try:
+        import uvloop
+        run = getattr(uvloop, "run", asyncio.run)
+    except ImportError:
+        run = asyncio.run
     if len(sys.argv) > 1:
         folders = sys.argv[1:]
-        asyncio.run(clear_data_folders(folders))
+        run(clear_data_folders(folders))
     else:
-        asyncio.run(clear_data_folders()) 
\ No newline at end of file
+        run(clear_data_folders()) 
\ No newline at end of file
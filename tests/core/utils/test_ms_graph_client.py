@@ -0,0 +1,133 @@
+"""
+Offline tests for the Microsoft Graph client download helpers.
+
+Requests are served by an httpx.MockTransport, so no credentials or
+network access are needed.
+"""
+
+import base64
+import json
+from urllib.parse import unquote
+
+import httpx
+import pytest
+
+from core.utils.ms_graph_client import GraphClient, GRAPH_BATCH_LIMIT
+
+BATCH_URL = "https://graph.microsoft.com/v1.0/$batch"
+DOWNLOAD_HOST = "download.example.com"
+
+def make_client(handler):
+    """Build a GraphClient whose HTTP traffic is served by handler."""
+    client = GraphClient.__new__(GraphClient)
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def _token():
+        return "token"
+
+    client._get_access_token = _token
+    return client
+
+def content_name(request):
+    """Return the file name from a single-file /content request."""
+    return unquote(request.url.path)[:-len(":/content")].rsplit("/", 1)[1]
+
+@pytest.fixture(autouse=True)
+def user_email(monkeypatch):
+    """Point the client at a fixed mailbox."""
+    monkeypatch.setenv("user_email", "me@example.com")
+
+def batch_handler(sub_response, files, batches=None):
+    """Serve $batch posts via sub_response(name) and plain GETs from files.
+
+    sub_response returns the sub-response dict for a name, or None to omit it.
+    Names missing from files get a 404 on direct download.
+    """
+    def handler(request):
+        if str(request.url) == BATCH_URL:
+            payload = json.loads(request.content)
+            if batches is not None:
+                batches.append(payload["requests"])
+            responses = []
+            for sub in payload["requests"]:
+                name = unquote(sub["url"])[:-len(":/content")].rsplit("/", 1)[1]
+                reply = sub_response(name)
+                if reply is not None:
+                    responses.append({"id": sub["id"], **reply})
+            return httpx.Response(200, json={"responses": responses})
+        if request.url.host == DOWNLOAD_HOST:
+            name = unquote(request.url.path.lstrip("/"))
+        else:
+            name = content_name(request)
+        if name in files:
+            return httpx.Response(200, content=files[name])
+        return httpx.Response(404)
+    return handler
+
+def redirect(name):
+    return {"status": 302, "headers": {"Location": f"https://{DOWNLOAD_HOST}/{name}"}}
+
+def inline(data):
+    return {"status": 200, "body": base64.b64encode(data).decode()}
+
+async def test_download_file_stream_writes_body(tmp_path):
+    body = bytes(range(256)) * 4096
+    client = make_client(batch_handler(None, {"big.bin": body}))
+    dst = tmp_path / "big.bin"
+    written = await client.download_file_stream("docs", "big.bin", str(dst), chunk_size=64 * 1024)
+    assert written == len(body)
+    assert dst.read_bytes() == body
+    await client.close()
+
+async def test_download_many_follows_redirects():
+    files = {"a.pdf": b"alpha"}
+    client = make_client(batch_handler(redirect, files))
+    assert await client.download_many("docs", ["a.pdf"]) == {"a.pdf": b"alpha"}
+    await client.close()
+
+async def test_download_many_decodes_inline_body():
+    client = make_client(batch_handler(lambda name: inline(b"inline"), {}))
+    assert await client.download_many("docs", ["a.txt"]) == {"a.txt": b"inline"}
+    await client.close()
+
+async def test_download_many_retries_throttled_individually():
+    files = {"a.pdf": b"alpha"}
+    client = make_client(batch_handler(lambda name: {"status": 429}, files))
+    assert await client.download_many("docs", ["a.pdf"]) == {"a.pdf": b"alpha"}
+    await client.close()
+
+async def test_download_many_retries_missing_sub_responses():
+    files = {"a.pdf": b"alpha", "b.pdf": b"beta"}
+    handler = batch_handler(lambda name: redirect(name) if name == "a.pdf" else None, files)
+    client = make_client(handler)
+    assert await client.download_many("docs", ["a.pdf", "b.pdf"]) == files
+    await client.close()
+
+async def test_download_many_chunks_at_batch_limit():
+    names = [f"f{i}.txt" for i in range(GRAPH_BATCH_LIMIT + 5)]
+    batches = []
+    client = make_client(batch_handler(lambda name: inline(name.encode()), {}, batches))
+    result = await client.download_many("docs", names)
+    assert [len(b) for b in batches] == [GRAPH_BATCH_LIMIT, 5]
+    assert result == {name: name.encode() for name in names}
+    await client.close()
+
+async def test_download_many_omits_failed_files():
+    # a.pdf redirects fine, b.pdf fails in the batch and its fallback 404s,
+    # c.pdf redirects to a download URL that 404s
+    files = {"a.pdf": b"alpha"}
+    handler = batch_handler(lambda name: {"status": 404} if name == "b.pdf" else redirect(name), files)
+    client = make_client(handler)
+    assert await client.download_many("docs", ["a.pdf", "b.pdf", "c.pdf"]) == {"a.pdf": b"alpha"}
+    await client.close()
+
+async def test_download_many_quotes_sub_request_urls():
+    batches = []
+    client = make_client(batch_handler(lambda name: inline(b"x"), {}, batches))
+    await client.download_many("my docs", ["my report.pdf", "gone #1.pdf"])
+    urls = [sub["url"] for sub in batches[0]]
+    assert urls == [
+        "/users/me@example.com/drive/root:/my%20docs/my%20report.pdf:/content",
+        "/users/me@example.com/drive/root:/my%20docs/gone%20%231.pdf:/content",
+    ]
+    await client.close()
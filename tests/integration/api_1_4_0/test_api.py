@@ -1,24 +1,27 @@
 import os
 import pytest
 import requests
-import json
 from typing import Dict, Any
 import logging
 
 # Configuration
 API_URL = "http://localhost:8000"  # Change this if your API runs on a different port
 PROXY_TOKEN = os.getenv("PROXY_TOKEN", "test-token")  # Use your actual token in production
+HEADERS = {
+    "x-api-key": PROXY_TOKEN,
+    "Content-Type": "application/json"
+}
 logger = logging.getLogger(__name__)
 
-@pytest.fixture
-def api_headers():
-    """Fixture to provide API headers"""
-    return {
-        "x-api-key": PROXY_TOKEN,
-        "Content-Type": "application/json"
-    }
+@pytest.fixture(scope="module")
+def client():
+    """Module-wide session so every request reuses the same keep-alive connection"""
+    with requests.Session() as session:
+        session.headers.update(HEADERS)
+        yield session
 
 def make_request(
+    client: requests.Session,
     method: str,
     endpoint: str,
     data: Dict[str, Any] = None,
@@ -26,33 +29,25 @@ def make_request(
 ) -> requests.Response:
     """Helper function to make API requests"""
     url = f"{API_URL}{endpoint}"
-    default_headers = {
-        "x-api-key": PROXY_TOKEN,
-        "Content-Type": "application/json"
-    }
-    if headers:
-        default_headers.update(headers)
-    
-    response = requests.request(
+    response = client.request(
         method=method,
         url=url,
         json=data,
-        headers=default_headers
+        headers=headers
     )
     
-    print(f"\n{method} {endpoint}")
-    print(f"Status: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2) if response.text else 'No content'}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s %s -> %s\n%s", method, endpoint, response.status_code, response.text)
     return response
 
-def test_health(api_headers):
+def test_health(client):
     """Test the health check endpoint"""
-    response = make_request("GET", "/health", headers=api_headers)
+    response = make_request(client, "GET", "/health")
     assert response.status_code == 200
     assert "status" in response.json()
     assert response.json()["status"] == "healthy"
 
-def test_assistant_creation(api_headers):
+def test_assistant_creation(client):
     """Test getting existing assistant or creating a new one"""
     data = {
         "name": "Test Assistant",
@@ -60,33 +55,34 @@ def test_assistant_creation(api_headers):
         "tools": ["file_search"],
         "instructions": "This is a test assistant"
     }
-    response = make_request("POST", "/assistant/create", data=data, headers=api_headers)
+    response = make_request(client, "POST", "/assistant/create", data=data)
     assert response.status_code == 200
     assert "assistant_id" in response.json()
     assert response.json()["assistant_id"] is not None
 
-def test_assistant_info(api_headers):
+def test_assistant_info(client):
     """Test getting assistant information"""
-    response = make_request("GET", "/assistant/info", headers=api_headers)
+    response = make_request(client, "GET", "/assistant/info")
     assert response.status_code == 200
     assert "id" in response.json()
     assert "name" in response.json()
 
-def test_ask_endpoint(api_headers):
+def test_ask_endpoint(client):
     """Test the ask endpoint"""
     data = {
         "query": "Hello, this is a test message"
     }
-    response = make_request("POST", "/ask", data=data, headers=api_headers)
+    response = make_request(client, "POST", "/ask", data=data)
     assert response.status_code == 200
     assert "conversation_id" in response.json()
     assert "answer" in response.json()
     assert response.json()["conversation_id"] is not None
     assert response.json()["answer"] is not None
 
-def test_invalid_token():
+def test_invalid_token(client):
     """Test API with invalid token"""
     response = make_request(
+        client,
         "GET",
         "/health",
         headers={"x-api-key": "invalid-token"}
@@ -97,7 +93,7 @@ def test_invalid_token():
 class TestAPIEndpoints:
     """Integration tests for API endpoints"""
     
-    def test_full_conversation_flow(self, api_headers):
+    def test_full_conversation_flow(self, client):
         """Test a complete conversation flow"""
         # Test assistant creation
         data = {
@@ -106,12 +102,12 @@ class TestAPIEndpoints:
             "tools": ["file_search"],
             "instructions": "This is a test assistant"
         }
-        create_response = make_request("POST", "/assistant/create", data=data, headers=api_headers)
+        create_response = make_request(client, "POST", "/assistant/create", data=data)
         assert create_response.status_code == 200
         assert "assistant_id" in create_response.json()
         
         # Get assistant info
-        info_response = make_request("GET", "/assistant/info", headers=api_headers)
+        info_response = make_request(client, "GET", "/assistant/info")
         assert info_response.status_code == 200
         assert "id" in info_response.json()
         assert "name" in info_response.json()
@@ -120,7 +116,7 @@ class TestAPIEndpoints:
         ask_data = {
             "query": "Hello, this is a test message"
         }
-        ask_response = make_request("POST", "/ask", data=ask_data, headers=api_headers)
+        ask_response = make_request(client, "POST", "/ask", data=ask_data)
         assert ask_response.status_code == 200
         assert "conversation_id" in ask_response.json()
         assert "answer" in ask_response.json() 
\ No newline at end of file
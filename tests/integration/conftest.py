@@ -0,0 +1,59 @@
+"""
+Shared fixtures for the integration tests.
+
+Clients and processors are built once per session so token acquisition and
+HTTP connection pools are reused across tests. Tests that use the async
+fixtures run on the session event loop via @pytest.mark.asyncio(scope="session").
+"""
+
+import os
+import pytest
+import pytest_asyncio
+
+from core.processing_1_2_0.processors.document_processor import DocumentProcessor
+from core.processing_1_2_0.processors.email_processor import EmailProcessor
+from core.storage_1_3_0.vector_repository import VectorRepository
+from core.utils.config import PROCESSING_CONFIG
+from core.utils.ms_graph_client import GraphClient
+
+@pytest.fixture(scope="session")
+def graph_env():
+    """Skip once per session if the Graph credentials are not configured."""
+    required_vars = ['CLIENT_ID', 'CLIENT_SECRET', 'TENANT_ID', 'USER_EMAIL']
+    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    if missing_vars:
+        pytest.skip(f"Missing required environment variables: {', '.join(missing_vars)}")
+
+@pytest_asyncio.fixture(scope="session")
+async def graph_client(graph_env):
+    """Shared GraphClient so the MSAL app and HTTP pool are built once per session."""
+    client = GraphClient()
+    yield client
+    await client.close()
+
+@pytest_asyncio.fixture(scope="session")
+async def email_processor():
+    """Shared EmailProcessor, closed at the end of the session."""
+    processor = EmailProcessor()
+    yield processor
+    await processor.close()
+
+@pytest.fixture(scope="session")
+def document_processor():
+    """Shared DocumentProcessor using the default processing configuration."""
+    return DocumentProcessor(PROCESSING_CONFIG)
+
+@pytest_asyncio.fixture(scope="session")
+async def vector_repo(graph_env):
+    """Shared VectorRepository, closed at the end of the session."""
+    repo = VectorRepository()
+    yield repo
+    await repo.close()
+
+@pytest.fixture(autouse=True)
+def _flush_itest_log(request):
+    """Flush a module's buffered itest_log at the end of every test, even when it fails."""
+    yield
+    itest_log = getattr(request.module, "itest_log", None)
+    if itest_log is not None:
+        itest_log.flush()
@@ -0,0 +1,41 @@
+"""
+Buffered logging shared by the integration test scripts.
+
+Per-file output is held in memory and written out once per test, by the
+autouse fixture in tests/integration/conftest.py, instead of hitting the
+console and the log file on every line.
+"""
+
+import logging
+import logging.handlers
+
+class BufferedTestLog:
+    """Console logger plus log-file lines, both buffered until flush()."""
+
+    def __init__(self, name, path):
+        self.path = path
+        self.logger = logging.getLogger(name)
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self._buffer = logging.handlers.MemoryHandler(capacity=10000, target=logging.StreamHandler())
+        self.logger.addHandler(self._buffer)
+        # Lines destined for path, written in one go by flush()
+        self._lines = []
+
+    def log(self, msg):
+        """Log msg to the console and queue it for the log file."""
+        self.logger.info(msg)
+        self._lines.append(str(msg) + "\n")
+
+    def flush(self):
+        """Write buffered output to the console and buffered lines to the log file."""
+        self._buffer.flush()
+        if self._lines:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.writelines(self._lines)
+            self._lines.clear()
+
+def file_ext(name):
+    """Return the lowercase extension of name including the dot, or "" if it has none."""
+    _, dot, ext = name.rpartition('.')
+    return f".{ext.lower()}" if dot else ""
@@ -11,21 +11,24 @@ import json
 from datetime import datetime
 import uuid
 
-from core.processing_1_2_0.processors.document_processor import DocumentProcessor
 from core.processing_1_2_0.processors.attachment_processor import AttachmentProcessor
 from core.graph_1_1_0.metadata import EmailDocumentMetadata
 from core.utils.config import config, PROCESSING_CONFIG
-from core.utils.ms_graph_client import GraphClient
+from tests.integration.log_buffer import BufferedTestLog, file_ext
 
 LOG_PATH = "itest_attachment_processing.log"
 
-def log(msg):
-    print(msg)
-    with open(LOG_PATH, "a", encoding="utf-8") as f:
-        f.write(str(msg) + "\n")
+itest_log = BufferedTestLog(__name__, LOG_PATH)
+logger = itest_log.logger
+log = itest_log.log
 
-@pytest.mark.asyncio
-async def test_attachment_processing_e2e():
+@pytest.fixture(scope="session")
+def attachment_processor(document_processor):
+    """Shared AttachmentProcessor wrapping the session DocumentProcessor."""
+    return AttachmentProcessor(document_processor)
+
+@pytest.mark.asyncio(scope="session")
+async def test_attachment_processing_e2e(graph_client, attachment_processor, tmp_path):
     """
     End-to-end integration test for AttachmentProcessor.
     Tests processing of real files from OneDrive as attachments.
@@ -34,17 +37,6 @@ async def test_attachment_processing_e2e():
     with open(LOG_PATH, "w", encoding="utf-8") as f:
         f.write("")
 
-    # Verify required environment variables
-    required_vars = ['CLIENT_ID', 'CLIENT_SECRET', 'TENANT_ID', 'USER_EMAIL']
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
-    if missing_vars:
-        log(f"Missing required environment variables: {', '.join(missing_vars)}")
-        pytest.skip(f"Missing required environment variables: {', '.join(missing_vars)}")
-
-    # Initialize processors
-    doc_processor = DocumentProcessor(PROCESSING_CONFIG)
-    attachment_processor = AttachmentProcessor(doc_processor)
-    
     # Create a sample parent email metadata
     parent_email = EmailDocumentMetadata(
         document_id=str(uuid.uuid4()),
@@ -65,7 +57,7 @@ async def test_attachment_processing_e2e():
     user_email = config["user"]["email"]
     docs_folder = PROCESSING_CONFIG["FOLDERS"]["DOCUMENTS"]
     processed_folder = PROCESSING_CONFIG["FOLDERS"]["PROCESSED_DOCUMENTS"]
-    allowed_exts = PROCESSING_CONFIG["ALLOWED_EXTENSIONS"]
+    allowed_exts = frozenset(e.lower() for e in PROCESSING_CONFIG["ALLOWED_EXTENSIONS"])
 
     log(f"\nConfiguration:")
     log(f"User email: {user_email}")
@@ -75,84 +67,96 @@ async def test_attachment_processing_e2e():
     log(f"Parent email ID: {parent_email.document_id}")
     log(f"Parent email subject: {parent_email.subject}")
 
-    graph_client = GraphClient()
     log(f"\nListing files in OneDrive folder: {docs_folder}")
     files = await graph_client.list_files_in_folder(docs_folder)
     log(f"Raw files found: {[f['name'] for f in files]}")
-    files = [f for f in files if os.path.splitext(f['name'])[1].lower() in allowed_exts]
+    files = [f for f in files if file_ext(f['name']) in allowed_exts]
 
     log(f"Found {len(files)} valid files in OneDrive folder.")
     if not files:
         log(f"No valid files found in OneDrive folder '{docs_folder}'. Allowed extensions: {allowed_exts}")
         pytest.skip(f"No valid files found in OneDrive folder '{docs_folder}'. Allowed extensions: {allowed_exts}")
 
-    # Process first 10 files as attachments
-    print(f"\nProcessing first 10 files as attachments:")
-    for i, file in enumerate(files[:10]):
-        print(f"\nProcessing file {i+1}/10: {file['name']}")
-        
-        # Download file
-        print(f"Downloading file...")
+    # Pipeline: downloads feed a bounded queue that processing workers drain,
+    # so parsing one file overlaps with downloading the next
+    logger.info(f"\nProcessing first 10 files as attachments:")
+    sem = asyncio.Semaphore(8)
+    queue = asyncio.Queue(maxsize=4)
+    n_workers = 3
+    processed = []
+
+    async def _fetch(file):
+        # Stream straight to disk so large attachments are never held in memory
+        file_path = str(tmp_path / file['name'])
         try:
-            content = await graph_client.download_file_from_onedrive(docs_folder, file['name'])
-            if not content:
-                print(f"Failed to download file: No content returned")
-                continue
-            print(f"Downloaded {len(content)} bytes")
-            
+            async with sem:
+                size = await graph_client.download_file_stream(docs_folder, file['name'], file_path)
+        except Exception as e:
+            logger.info(f"Error downloading file {file['name']}: {str(e)}")
+            return
+        if not size:
+            logger.info(f"Failed to download file {file['name']}: No content returned")
+            return
+        logger.info(f"Downloaded {file['name']}: {size} bytes")
+        await queue.put((file, file_path))
+
+    async def _produce():
+        await asyncio.gather(*[_fetch(f) for f in files[:10]])
+        for _ in range(n_workers):
+            await queue.put(None)
+
+    async def _consume():
+        while (item := await queue.get()) is not None:
+            file, file_path = item
             try:
-                # Process file as attachment
-                print(f"Processing with AttachmentProcessor...")
                 result = await attachment_processor.process(
-                    content=content,
+                    file_path=file_path,
                     filename=file['name'],
                     parent_email_meta=parent_email
                 )
-                
-                # Print metadata
-                print("\nGenerated metadata:")
-                print(f"Filename: {result['metadata'].filename}")
-                print(f"Title: {result['metadata'].title}")
-                print(f"Type: {result['metadata'].type}")
-                print(f"Is attachment: {result['metadata'].is_attachment}")
-                print(f"Parent email ID: {result['metadata'].parent_email_id}")
-                print(f"From: {result['metadata'].from_}")
-                print(f"Subject: {result['metadata'].subject}")
-                print(f"OneDrive URL: {result['metadata'].one_drive_url}")
-                print(f"Content type: {result['metadata'].content_type}")
-                print(f"Size: {result['metadata'].size} bytes")
-                print(f"Text content length: {len(result['metadata'].text_content)} characters")
-                
             except Exception as e:
-                print(f"Error processing file: {str(e)}")
-                import traceback
-                print(traceback.format_exc())
-                continue
-                
-        except Exception as e:
-            print(f"Error downloading file: {str(e)}")
+                result = e
+            processed.append((file, result))
+
+    await asyncio.gather(_produce(), *[_consume() for _ in range(n_workers)])
+
+    for i, (file, result) in enumerate(processed):
+        logger.info(f"\nProcessed file {i+1}/{len(processed)}: {file['name']}")
+        if isinstance(result, Exception):
+            logger.info(f"Error processing file: {str(result)}")
             import traceback
-            print(traceback.format_exc())
+            logger.info("".join(traceback.format_exception(result)))
             continue
 
+        # Print metadata
+        logger.info("\nGenerated metadata:")
+        logger.info(f"Filename: {result['metadata'].filename}")
+        logger.info(f"Title: {result['metadata'].title}")
+        logger.info(f"Type: {result['metadata'].type}")
+        logger.info(f"Is attachment: {result['metadata'].is_attachment}")
+        logger.info(f"Parent email ID: {result['metadata'].parent_email_id}")
+        logger.info(f"From: {result['metadata'].from_}")
+        logger.info(f"Subject: {result['metadata'].subject}")
+        logger.info(f"OneDrive URL: {result['metadata'].one_drive_url}")
+        logger.info(f"Content type: {result['metadata'].content_type}")
+        logger.info(f"Size: {result['metadata'].size} bytes")
+        logger.info(f"Text content length: {len(result['metadata'].text_content)} characters")
+
     # Verify results in OneDrive
-    print("\nVerifying processed files in OneDrive...")
+    logger.info("\nVerifying processed files in OneDrive...")
     processed_files = await graph_client.list_files_in_folder(processed_folder)
-    print(f"\nFound {len(processed_files)} files in {processed_folder}:")
+    logger.info(f"\nFound {len(processed_files)} files in {processed_folder}:")
     for file in processed_files:
-        print(f"- {file['name']}")
+        logger.info(f"- {file['name']}")
     
     log(f"\nProcessed {len(files[:10])} files as attachments.")
     log(f"Results are available in OneDrive folder: {processed_folder}")
     
-    # List files in processed folder to verify
-    log(f"\nVerifying files in processed folder: {processed_folder}")
-    processed_files = await graph_client.list_files_in_folder(processed_folder)
     log(f"Files found in processed folder: {[f['name'] for f in processed_files]}")
     # No assertions: manual review only 
 
-@pytest.mark.asyncio
-async def test_attachment_processing_blending():
+@pytest.mark.asyncio(scope="session")
+async def test_attachment_processing_blending(graph_client, attachment_processor):
     """
     Integration test for AttachmentProcessor with JSON blending.
     Downloads an attachment and its paired JSON, processes, and checks blended metadata.
@@ -162,18 +166,9 @@ async def test_attachment_processing_blending():
     with open(LOG_PATH, "w", encoding="utf-8") as f:
         f.write("")
 
-    required_vars = ['CLIENT_ID', 'CLIENT_SECRET', 'TENANT_ID', 'USER_EMAIL']
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
-    if missing_vars:
-        log(f"Missing required environment variables: {', '.join(missing_vars)}")
-        pytest.skip(f"Missing required environment variables: {', '.join(missing_vars)}")
-
-    doc_processor = DocumentProcessor(PROCESSING_CONFIG)
-    attachment_processor = AttachmentProcessor(doc_processor)
     attachments_folder = PROCESSING_CONFIG["FOLDERS"]["ATTACHMENTS"]
-    allowed_exts = PROCESSING_CONFIG["ALLOWED_EXTENSIONS"]
+    allowed_exts = frozenset(e.lower() for e in PROCESSING_CONFIG["ALLOWED_EXTENSIONS"])
 
-    graph_client = GraphClient()
     log(f"\nListing files in OneDrive folder: {attachments_folder}")
     files = await graph_client.list_files_in_folder(attachments_folder)
     all_filenames = set(f['name'] for f in files)
@@ -183,7 +178,7 @@ async def test_attachment_processing_blending():
     candidate_files = []
     for f in files:
         name = f['name']
-        ext = os.path.splitext(name)[1].lower()
+        ext = file_ext(name)
         json_name = name + ".json"
         if ext in allowed_exts and json_name in all_filenames:
             candidate_files.append(name)
@@ -193,13 +188,19 @@ async def test_attachment_processing_blending():
         log(f"No valid attachment+json pairs found in '{attachments_folder}'.")
         pytest.skip(f"No valid attachment+json pairs found in '{attachments_folder}'.")
 
-    # Use up to the first 10 valid pairs
-    for filename in candidate_files[:10]:
-        json_filename = filename + ".json"
+    # Download up to the first 10 valid pairs concurrently
+    sem = asyncio.Semaphore(8)
+
+    async def _fetch_pair(filename):
+        async with sem:
+            return await asyncio.gather(
+                graph_client.download_file_from_onedrive(attachments_folder, filename),
+                graph_client.download_file_from_onedrive(attachments_folder, filename + ".json"),
+            )
+
+    pairs = await asyncio.gather(*[_fetch_pair(name) for name in candidate_files[:10]])
 
-        # Download attachment and paired JSON
-        content = await graph_client.download_file_from_onedrive(attachments_folder, filename)
-        json_content = await graph_client.download_file_from_onedrive(attachments_folder, json_filename)
+    for filename, (content, json_content) in zip(candidate_files[:10], pairs):
         if not content or not json_content:
             log(f"Could not download both attachment and paired JSON for {filename}")
             continue
@@ -8,9 +8,9 @@ from core.utils.onedrive_utils import list_folder_contents
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(scope="session")
 @pytest.mark.integration
-async def test_vector_store_integration():
+async def test_vector_store_integration(vector_repo):
     """Integration test for uploading real processed documents to vector store.
     
     This test processes a limited number of files (20) to verify the upload functionality
@@ -34,11 +34,13 @@ async def test_vector_store_integration():
     assert total_files > 0, f"No JSON files found in OneDrive folder: {processed_docs_folder}"
     logger.info(f"Testing with {total_files} JSON files from {processed_docs_folder}")
 
-    # Initialize repository
-    repo = VectorRepository()
-    
     # Upload in batches of 5
-    stats = await repo.batch_upload(processed_docs_folder, batch_size=5, file_filter=lambda f: f["name"] in test_file_names)
+    stats = await vector_repo.batch_upload(
+        processed_docs_folder,
+        batch_size=5,
+        names=test_file_names,
+        files=files
+    )
     
     # Verify results
     assert stats["success"] > 0, "No files were uploaded successfully"
@@ -51,5 +53,18 @@ async def test_vector_store_integration():
     # Assert reasonable success rate (adjust threshold as needed)
     assert success_rate > 80, f"Success rate too low: {success_rate:.1f}%"
 
+async def main():
+    """Run the integration test outside pytest with its own repository."""
+    repo = VectorRepository()
+    try:
+        await test_vector_store_integration(repo)
+    finally:
+        await repo.close()
+
 if __name__ == "__main__":
-    asyncio.run(test_vector_store_integration()) 
\ No newline at end of file
+    try:
+        import uvloop
+        run = getattr(uvloop, "run", asyncio.run)
+    except ImportError:
+        run = asyncio.run
+    run(main()) 
\ No newline at end of file